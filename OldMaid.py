@@ -1,4 +1,8 @@
+import contextlib
+import io
 import random
+from fractions import Fraction
+from functools import lru_cache
 
 def create_deck():
     """
@@ -48,12 +52,18 @@ def remove_pairs(hand):
         tuple: (Modified hand without pairs, Number of pairs removed)
     """
     ranks = [card['rank'] for card in hand]
-    # Find ranks that appear exactly twice (pairs)
-    pairs = set([rank for rank in ranks if ranks.count(rank) == 2])
+    # Pair off every rank as often as possible; an odd count leaves one card
+    counts = {rank: ranks.count(rank) for rank in set(ranks)}
+    pairs = sum(count // 2 for count in counts.values())
     
-    # Create new hand excluding the paired cards
-    new_hand = [card for card in hand if card['rank'] not in pairs]
-    return new_hand, len(pairs)
+    # Create new hand keeping one card of each rank with an odd count
+    new_hand = []
+    kept = set()
+    for card in hand:
+        if counts[card['rank']] % 2 == 1 and card['rank'] not in kept:
+            new_hand.append(card)
+            kept.add(card['rank'])
+    return new_hand, pairs
 
 def display_hand(hand, player_name):
     """
@@ -118,6 +128,150 @@ def computer_draw_card(computer_hand, human_hand):
     
     return computer_hand, human_hand
 
+@lru_cache(maxsize=None)
+def _human_old_maid_probability(human_cards, computer_cards, turn, human_avoids_old_maid):
+    """
+    Exact probability that the human ends up as the Old Maid.
+    
+    The state is compact: remove_pairs leaves at most one card of each rank
+    in a hand, and only the Queens have an odd total, so every card except
+    the last unpaired Queen (the Old Maid) has its match in the other hand.
+    The Old Maid is therefore always in the larger hand. Results are
+    memoized for the lifetime of the process and kept as exact fractions.
+    
+    Args:
+        human_cards (int): Cards in the human's hand
+        computer_cards (int): Cards in the computer's hand
+        turn (int): Player who draws next, 0 for Human, 1 for Computer
+        human_avoids_old_maid (bool): Whether the human never draws the Old Maid
+    Returns:
+        Fraction: Probability that the human is left with the Old Maid
+    """
+    # Game over: whoever still holds a card holds the Old Maid
+    if human_cards == 0:
+        return Fraction(0)
+    if computer_cards == 0:
+        return Fraction(1)
+    
+    # Old Maid is with the drawing player, so every draw makes a pair
+    if turn == 0 and human_cards > computer_cards:
+        return _human_old_maid_probability(human_cards - 1, computer_cards - 1, 1, human_avoids_old_maid)
+    if turn == 1 and computer_cards > human_cards:
+        return _human_old_maid_probability(human_cards - 1, computer_cards - 1, 0, human_avoids_old_maid)
+    
+    # The drawer takes the Old Maid with chance q1, then the other player
+    # takes it straight back with chance q2, returning to this same state.
+    # Solve p = q1 * (q2 * p + (1 - q2) * y) + (1 - q1) * x for p instead
+    # of recursing forever.
+    holder_cards = max(human_cards, computer_cards)
+    human_q = Fraction(0) if human_avoids_old_maid else Fraction(1, holder_cards)
+    computer_q = Fraction(1, holder_cards)
+    if turn == 0:
+        q1, q2 = human_q, computer_q
+        x = _human_old_maid_probability(human_cards - 1, computer_cards - 1, 1, human_avoids_old_maid)
+        y = _human_old_maid_probability(computer_cards - 1, human_cards - 1, 0, human_avoids_old_maid)
+    else:
+        q1, q2 = computer_q, human_q
+        x = _human_old_maid_probability(human_cards - 1, computer_cards - 1, 0, human_avoids_old_maid)
+        y = _human_old_maid_probability(computer_cards - 1, human_cards - 1, 1, human_avoids_old_maid)
+    return (q1 * (1 - q2) * y + (1 - q1) * x) / (1 - q1 * q2)
+
+def _is_count(value):
+    """Check that a value is a plain int (not a bool)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def old_maid_odds(human_cards, computer_cards, turn=0, human_avoids_old_maid=False):
+    """
+    Compute the exact chance of each player ending up as the Old Maid.
+    
+    The computer always draws uniformly at random. By default the human does
+    too, but human_draw_card shows the computer's hand face up, so a human
+    who looks can dodge the Queen every time; pass human_avoids_old_maid=True
+    to model that player instead.
+    
+    Args:
+        human_cards (int): Size of the human's hand after remove_pairs
+        computer_cards (int): Size of the computer's hand after remove_pairs
+        turn (int): Player who draws next, 0 for Human, 1 for Computer
+        human_avoids_old_maid (bool): Whether the human never draws the Old Maid
+    Returns:
+        tuple: (Probability the human is the Old Maid,
+                Probability the computer is the Old Maid)
+    
+    Examples:
+        >>> old_maid_odds(2, 3, 0)
+        (0.25, 0.75)
+        >>> old_maid_odds(1, 0, 0)
+        (1.0, 0.0)
+        >>> old_maid_odds(2, 3, 0, human_avoids_old_maid=True)
+        (0.0, 1.0)
+    """
+    if not _is_count(human_cards) or not _is_count(computer_cards):
+        raise TypeError("Hand sizes must be integers.")
+    if not _is_count(turn):
+        raise TypeError("Turn must be an integer.")
+    if human_cards < 0 or computer_cards < 0:
+        raise ValueError("Hand sizes cannot be negative.")
+    if abs(human_cards - computer_cards) != 1:
+        raise ValueError("Hand sizes after removing pairs must differ by exactly one.")
+    if turn not in (0, 1):
+        raise ValueError("Turn must be 0 for Human or 1 for Computer.")
+    
+    human_loses = _human_old_maid_probability(human_cards, computer_cards, turn, bool(human_avoids_old_maid))
+    return float(human_loses), float(1 - human_loses)
+
+def _rollout_old_maid(games, human_avoids_old_maid=False):
+    """
+    Play random games with the real deal, pair and draw functions.
+    
+    Used to check old_maid_odds against play: over many games the human's
+    loss rate should match the solver's average prediction for each deal.
+    
+    Args:
+        games (int): Number of games to play
+        human_avoids_old_maid (bool): Whether the human never draws the Old Maid
+    Returns:
+        tuple: (Observed human loss rate, Average predicted human loss rate)
+    
+    Examples:
+        >>> random.seed(2024)
+        >>> observed, predicted = _rollout_old_maid(2000)
+        >>> abs(observed - predicted) < 0.03
+        True
+        >>> observed, predicted = _rollout_old_maid(2000, human_avoids_old_maid=True)
+        >>> abs(observed - predicted) < 0.03
+        True
+    """
+    losses = 0
+    predicted = 0.0
+    for _ in range(games):
+        human, computer = deal_cards(remove_queen(create_deck()))
+        human, _ = remove_pairs(human)
+        computer, _ = remove_pairs(computer)
+        predicted += old_maid_odds(len(human), len(computer), 0, human_avoids_old_maid)[0]
+        
+        turn = 0
+        # Silence the draw messages printed by computer_draw_card
+        with contextlib.redirect_stdout(io.StringIO()):
+            while len(human) > 0 and len(computer) > 0:
+                if turn == 0:
+                    safe = [card for card in computer if card['rank'] != 'Queen']
+                    if human_avoids_old_maid and safe:
+                        card_drawn = random.choice(safe)
+                        computer.remove(card_drawn)
+                        human.append(card_drawn)
+                    else:
+                        human, computer = computer_draw_card(human, computer)
+                    human, _ = remove_pairs(human)
+                else:
+                    computer, human = computer_draw_card(computer, human)
+                    computer, _ = remove_pairs(computer)
+                turn = 1 - turn
+        
+        if len(human) == 1:
+            losses += 1
+    return losses / games, predicted / games
+
 def play_old_maid():
     """
     Main game loop for Old Maid card game.